@@ -3,20 +3,61 @@
 # ===================================================================
 # MP3 Combiner - A tool for combining multiple MP3 files into one
 # ===================================================================
-# Before running this script, please install the required dependency:
-#   pip install pydub
-# 
-# Note: pydub also requires ffmpeg or libav to be installed on your system.
-# For more information, visit: https://github.com/jiaaro/pydub#dependencies
+# Before running this script, please install ffmpeg, which provides the
+# ffmpeg and ffprobe commands used to decode, encode and inspect MP3 files.
+# For more information, visit: https://ffmpeg.org/download.html
 # ===================================================================
 
 import argparse
+import collections
+import functools
+import json
 import os
+import shutil
+import subprocess
 import sys
+import select
+import tempfile
+import threading
 import tty
 import termios
-from pydub import AudioSegment
-from pydub.exceptions import CouldntDecodeError
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+# PCM layout every track is normalized to before combining
+SAMPLE_RATE = 44100
+CHANNELS = 2
+SAMPLE_WIDTH = 2
+
+# ffmpeg encoder options for each --quality choice
+QUALITY_OPTIONS = {
+    'v0': ['-q:a', '0'],
+    'v2': ['-q:a', '2'],
+    '320k': ['-b:a', '320k'],
+}
+
+# Number of files ahead of the current one to prefetch into the page cache
+PREFETCH_AHEAD = 64
+
+# Escape sequences sent by the up and down arrow keys
+KEY_UP = '\x1b[A'
+KEY_DOWN = '\x1b[B'
+
+# Seconds to wait for the rest of an escape sequence split across reads
+ESCAPE_TIMEOUT = 0.05
+
+# Terminal row of the first file in the list, below the header lines
+LIST_START_ROW = 5
+
+# Focus and selection from the previous call to display_mp3_files
+_prev_focused_index = None
+_prev_selected_index = None
+
+# Terminal size at the last full draw, or None if that draw did not fit
+_drawn_terminal_size = None
+
+# Whether a status line is shown below the instructions
+_status_drawn = False
 
 def list_mp3_files(folder_path):
     """
@@ -26,42 +67,325 @@ def list_mp3_files(folder_path):
         folder_path: Path to the folder containing MP3 files
         
     Returns:
-        A sorted list of MP3 filenames
+        A tuple of the sorted list of MP3 filenames and a list of the
+        matching full paths
     """
-    # Get all files and directories in the folder
-    all_items = os.listdir(folder_path)
-    
-    # Filter to only include files with .mp3 extension
-    mp3_files = [file for file in all_items if file.lower().endswith('.mp3')]
+    # Scan the folder, keeping only regular files with an .mp3 extension;
+    # scandir already knows the entry type, so no extra stat is needed
+    with os.scandir(folder_path) as entries:
+        mp3_entries = [entry for entry in entries
+                       if entry.name[-4:].lower() == '.mp3' and entry.is_file()]
     
     # Sort the list alphabetically
-    sorted_mp3_files = sorted(mp3_files)
+    mp3_entries.sort(key=lambda entry: entry.name)
     
-    return sorted_mp3_files
+    mp3_files = [entry.name for entry in mp3_entries]
+    mp3_paths = [entry.path for entry in mp3_entries]
+    
+    return mp3_files, mp3_paths
 
-def generate_silence(duration_ms):
+def is_same_file(path, other_path):
     """
-    Generate a silent AudioSegment with the specified duration.
+    Check whether two paths refer to the same existing file.
     
     Args:
-        duration_ms: Duration of silence in milliseconds
+        path: The first path
+        other_path: The second path, which need not exist
         
     Returns:
-        An AudioSegment object representing silence
+        True if both paths exist and are the same file, otherwise False
     """
-    return AudioSegment.silent(duration=duration_ms)
+    try:
+        return os.path.samefile(path, other_path)
+    except OSError:
+        return False
 
-def read_mp3_file(file_path):
+def decode_to_pcm(file_path):
     """
-    Read an MP3 file and load it into an AudioSegment object.
+    Decode an MP3 file to raw PCM data in the common layout.
+    
+    The file is decoded, resampled and downmixed by an ffmpeg process that
+    writes raw PCM to a pipe, so the data is read into memory only once.
     
     Args:
-        file_path: Path to the MP3 file to read
+        file_path: Path to the MP3 file to decode
         
     Returns:
-        An AudioSegment object containing the audio from the MP3 file
+        The decoded audio as raw PCM bytes
+    """
+    result = subprocess.run(
+        ['ffmpeg', '-loglevel', 'error', '-i', file_path, '-vn',
+         '-f', 's16le', '-ar', str(SAMPLE_RATE), '-ac', str(CHANNELS), 'pipe:1'],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+    return result.stdout
+
+def prefetch_files(file_paths):
+    """
+    Ask the kernel to start reading files into the page cache.
+    
+    This is only a hint, so that the files are already in memory when the
+    decoders open them. It does nothing where posix_fadvise is unavailable.
+    
+    Args:
+        file_paths: Paths of the files to prefetch
     """
-    return AudioSegment.from_mp3(file_path)
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    
+    for file_path in file_paths:
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError:
+            # A file that cannot be opened is reported when it is decoded
+            pass
+
+def collect_decoded_tracks(executor, mp3_files, full_paths, max_pending):
+    """
+    Decode MP3 files and yield their PCM data in playlist order.
+    
+    Decodes are submitted to the executor only as far as max_pending files
+    ahead, counting the file being collected. Each decode returns a whole
+    track, so at most max_pending whole tracks of PCM are held in memory at
+    once, however many files the playlist has; the memory used still grows
+    with the length of the individual tracks. The first
+    PREFETCH_AHEAD files are expected to have been prefetched already; each
+    file collected prefetches the one PREFETCH_AHEAD further on. Files that
+    fail to decode are reported and skipped.
+    
+    Args:
+        executor: Executor used to run decode_to_pcm
+        mp3_files: The filenames to decode, used for messages
+        full_paths: The paths of the files to decode
+        max_pending: Maximum number of decodes submitted but not yet collected
+        
+    Yields:
+        Raw PCM bytes for each file that could be decoded
+    """
+    pending = collections.deque()
+    next_index = 0
+    
+    for i, filename in enumerate(mp3_files):
+        # Keep the decoders busy with the files that come next
+        while next_index < len(full_paths) and len(pending) < max_pending:
+            pending.append(executor.submit(decode_to_pcm, full_paths[next_index]))
+            next_index += 1
+        
+        prefetch_files(full_paths[i + PREFETCH_AHEAD:i + PREFETCH_AHEAD + 1])
+        
+        print(f"Processing: {filename}")
+        
+        # Collect the decoded audio with error handling
+        try:
+            yield pending.popleft().result()
+        except (subprocess.CalledProcessError, IOError, OSError) as e:
+            print(f"Warning: Could not process file '{filename}'. Skipping. Error: {str(e)}")
+
+def encode_pcm_chunks(pcm_chunks, output_file_path, silence_ms, quality):
+    """
+    Encode raw PCM chunks to a single MP3 file, with silence between them.
+    
+    The chunks are streamed into one ffmpeg process as they arrive, so the
+    combined audio is never held in memory. The encoder is only started
+    once the first chunk is available.
+    
+    Args:
+        pcm_chunks: Iterable of raw PCM bytes, all in the common layout
+        output_file_path: Path where the MP3 file will be saved
+        silence_ms: Duration of silence between tracks in milliseconds
+        quality: Encoding quality, one of the QUALITY_OPTIONS keys
+        
+    Returns:
+        The total number of PCM bytes encoded, or 0 if there were no chunks
+    """
+    # The same block of zeroed PCM is written for every gap
+    silence = bytes(SAMPLE_RATE * silence_ms // 1000 * CHANNELS * SAMPLE_WIDTH)
+    encoder = None
+    total = 0
+    
+    try:
+        for pcm in pcm_chunks:
+            if encoder is None:
+                encoder = subprocess.Popen(
+                    ['ffmpeg', '-loglevel', 'error', '-y',
+                     '-f', 's16le', '-ar', str(SAMPLE_RATE), '-ac', str(CHANNELS), '-i', 'pipe:0',
+                     '-f', 'mp3', '-codec:a', 'libmp3lame', *QUALITY_OPTIONS[quality], output_file_path],
+                    stdin=subprocess.PIPE,
+                )
+            else:
+                # Add silence between tracks
+                encoder.stdin.write(silence)
+                total += len(silence)
+            
+            encoder.stdin.write(pcm)
+            total += len(pcm)
+    except BrokenPipeError:
+        # The encoder exited early; its exit status is checked below
+        pass
+    finally:
+        if encoder is not None:
+            try:
+                encoder.stdin.close()
+            except BrokenPipeError:
+                pass
+            encoder.wait()
+    
+    if encoder is not None and encoder.returncode != 0:
+        raise subprocess.CalledProcessError(encoder.returncode, encoder.args)
+    
+    return total
+
+@functools.lru_cache(maxsize=None)
+def _probe_mp3_stream(file_path, mtime_ns, size):
+    """Run ffprobe on a file; the modification time and size key the cache."""
+    output = subprocess.check_output(
+        ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_streams', '-select_streams', 'a:0',
+         file_path],
+        stdin=subprocess.DEVNULL,
+    )
+    return json.loads(output)['streams'][0]
+
+def probe_mp3_file(file_path):
+    """
+    Read the properties of the audio stream in an MP3 file with ffprobe.
+    
+    Results are cached for as long as the file's modification time and
+    size stay the same, so a file is normally only probed once.
+    
+    Args:
+        file_path: Path to the MP3 file to probe
+        
+    Returns:
+        A dict of the first audio stream's properties as reported by ffprobe
+    """
+    stat = os.stat(file_path)
+    return _probe_mp3_stream(file_path, stat.st_mtime_ns, stat.st_size)
+
+def start_background_probes(file_paths):
+    """
+    Probe MP3 files in a background thread to fill the probe cache.
+    
+    This runs while the file list is being arranged, so the probes needed
+    when combining are usually already done. Files that cannot be probed
+    are left for the combine step to deal with.
+    
+    Args:
+        file_paths: Paths of the MP3 files to probe
+    """
+    def probe_all():
+        for file_path in file_paths:
+            try:
+                probe_mp3_file(file_path)
+            except (subprocess.CalledProcessError, OSError, ValueError, LookupError):
+                pass
+    
+    # A daemon thread, so quitting does not wait for the remaining probes
+    threading.Thread(target=probe_all, daemon=True).start()
+
+def get_stream_copy_params(full_paths):
+    """
+    Check whether MP3 files can be joined without re-encoding.
+    
+    Args:
+        full_paths: Paths of the MP3 files to combine
+        
+    Returns:
+        A (sample_rate, channels, bit_rate) tuple shared by every file, or
+        None if any file differs, could not be probed, or is missing one of
+        these values (as free-format MP3 files are missing the bit rate)
+    """
+    shared_params = None
+    for full_path in full_paths:
+        try:
+            stream = probe_mp3_file(full_path)
+        except (subprocess.CalledProcessError, OSError, ValueError, LookupError):
+            return None
+        
+        if stream.get('codec_name') != 'mp3':
+            return None
+        
+        params = (stream.get('sample_rate'), stream.get('channels'), stream.get('bit_rate'))
+        if None in params:
+            return None
+        
+        if shared_params is None:
+            shared_params = params
+        elif params != shared_params:
+            return None
+    
+    return shared_params
+
+def concat_mp3_files(full_paths, output_file_path, stream_params, silence_ms):
+    """
+    Join MP3 files with matching parameters by copying their frames.
+    
+    A silent MP3 with the same parameters is encoded once and placed
+    between the tracks, and ffmpeg's concat demuxer copies the MP3 frames
+    to the output without decoding or re-encoding them. Only the audio is
+    copied; cover art and other streams are dropped.
+    
+    The output is written to a temporary file next to it and only moved
+    into place once ffmpeg succeeds, so a failure leaves any existing file
+    at output_file_path untouched, and an input that is also the output is
+    never read while it is being overwritten.
+    
+    Args:
+        full_paths: Paths of the MP3 files to combine, in order
+        output_file_path: Path where the combined MP3 file will be saved
+        stream_params: The (sample_rate, channels, bit_rate) shared by the files
+        silence_ms: Duration of silence between tracks in milliseconds
+    """
+    sample_rate, channels, bit_rate = stream_params
+    channel_layout = 'mono' if channels == 1 else 'stereo'
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        silence_path = os.path.join(temp_dir, 'silence.mp3')
+        subprocess.run(
+            ['ffmpeg', '-loglevel', 'error',
+             '-f', 'lavfi', '-i', f'anullsrc=r={sample_rate}:cl={channel_layout}', '-t', str(silence_ms / 1000),
+             '-c:a', 'libmp3lame', '-b:a', bit_rate, silence_path],
+            stdin=subprocess.DEVNULL,
+            check=True,
+        )
+        
+        # Write the concat list, with the silence between each pair of tracks
+        list_path = os.path.join(temp_dir, 'files.txt')
+        with open(list_path, 'w') as list_file:
+            for i, full_path in enumerate(full_paths):
+                if i > 0:
+                    list_file.write(f"file '{silence_path}'\n")
+                escaped_path = os.path.abspath(full_path).replace("'", "'\\''")
+                list_file.write(f"file '{escaped_path}'\n")
+        
+        fd, partial_path = tempfile.mkstemp(prefix='.mp3_combiner-', suffix='.mp3',
+                                            dir=os.path.dirname(os.path.abspath(output_file_path)))
+        os.close(fd)
+        try:
+            # mkstemp makes the file private; give it the mode a new file would get
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(partial_path, 0o666 & ~umask)
+            
+            subprocess.run(
+                ['ffmpeg', '-loglevel', 'error', '-y',
+                 '-f', 'concat', '-safe', '0', '-i', list_path,
+                 '-map', '0:a', '-c', 'copy', '-f', 'mp3', partial_path],
+                stdin=subprocess.DEVNULL,
+                check=True,
+            )
+            os.replace(partial_path, output_file_path)
+        except BaseException:
+            try:
+                os.remove(partial_path)
+            except OSError:
+                pass
+            raise
 
 def parse_arguments():
     """Parse command line arguments for the MP3 combiner."""
@@ -73,52 +397,212 @@ def parse_arguments():
     parser.add_argument('output_file', 
                         help='Path where the combined MP3 file will be saved')
     
+    # Add optional arguments
+    parser.add_argument('--quality', choices=QUALITY_OPTIONS, default='v2',
+                        help='MP3 encoding quality: VBR V0, VBR V2 or CBR 320k (default: v2). '
+                             'Not used when the files are joined without re-encoding')
+    
     # Parse the arguments
     args = parser.parse_args()
     
     # Store the argument values in variables
     input_folder_path = args.input_folder
     output_file_path = args.output_file
+    quality = args.quality
     
-    return input_folder_path, output_file_path
+    return input_folder_path, output_file_path, quality
 
 def clear_screen():
     """Clear the terminal screen."""
     # ANSI escape code to clear screen and move cursor to home position
     print("\033[2J\033[H", end="", flush=True)
 
-def display_mp3_files(mp3_files, focused_index, selected_index, input_folder_path, output_file_path):
-    """Display the MP3 files with the focused file highlighted."""
-    clear_screen()
-    
-    # Print info with proper line endings
-    print(f"Input folder: {input_folder_path}\r")
-    print(f"Output file: {output_file_path}\r")
-    
-    print("\nMP3 files found:\r")
-    for idx, file in enumerate(mp3_files):
-        if idx == focused_index and idx == selected_index:
-            # Both focused and selected
-            print(f"- *> SELECTED >*{file}\r")
-        elif idx == focused_index:
-            # Only focused
-            print(f"- *> {file} <*\r")
-        elif idx == selected_index:
-            # Only selected
-            print(f"- *> SELECTED >*{file}\r")
-        else:
-            # Neither focused nor selected
-            print(f"- {file}\r")
-    
-    print("\nUse up/down arrow keys to navigate, Enter to select/deselect, 'q' to quit\r")
-    print("When an item is selected, up/down arrows will reorder it in the list\r")
-    print("Press 'd' to delete the selected item\r")
-    print("Press 'c' to combine files in the current order\r")
+def write_to_terminal(text):
+    """
+    Write text to stdout with as few write system calls as possible.
+    
+    Anything already buffered in sys.stdout is flushed first so output
+    stays in order; the text itself bypasses sys.stdout.
+    
+    Args:
+        text: The text to write
+    """
     sys.stdout.flush()
+    data = memoryview(text.encode())
+    while data:
+        written = os.write(sys.stdout.fileno(), data)
+        data = data[written:]
+
+def read_keys(fd):
+    """
+    Yield keypresses read from a raw-mode terminal.
+    
+    Input is read in blocks with os.read, and every key in the block is
+    yielded in turn. An Escape starts a three-byte sequence if followed by
+    '[', and otherwise takes the next byte with it (as sent for Alt+key).
+    If a block ends partway through a sequence, the rest is waited for
+    briefly with select, so a split sequence still parses while a lone
+    Escape key does not hang the UI. Arrow up/down sequences are yielded
+    as KEY_UP/KEY_DOWN; all other escape sequences are ignored.
+    
+    Args:
+        fd: File descriptor of the terminal
+        
+    Yields:
+        KEY_UP, KEY_DOWN, or a single character
+    """
+    while True:
+        data = os.read(fd, 16)
+        if not data:
+            # End of input
+            return
+        i = 0
+        while i < len(data):
+            if data[i] != 0x1b:
+                yield chr(data[i])
+                i += 1
+                continue
+            
+            # Escape: wait briefly for the rest of the sequence if needed
+            sequence_length = 3 if data.startswith(b'\x1b[', i) else 2
+            while len(data) - i < sequence_length:
+                more = b''
+                if select.select([fd], [], [], ESCAPE_TIMEOUT)[0]:
+                    more = os.read(fd, 16)
+                if not more:
+                    break
+                data += more
+                sequence_length = 3 if data.startswith(b'\x1b[', i) else 2
+            
+            key = data[i:i + sequence_length].decode('ascii', 'replace')
+            if key in (KEY_UP, KEY_DOWN):
+                yield key
+            i += sequence_length
+
+def clip_to_width(text, width):
+    """
+    Cut text so that it takes up at most width terminal columns.
+    
+    Wide characters count as two columns and combining characters as none,
+    so a clipped line never wraps onto the next terminal row.
+    
+    Args:
+        text: The text to clip
+        width: Maximum number of columns
+        
+    Returns:
+        The text, shortened if needed
+    """
+    used = 0
+    for i, char in enumerate(text):
+        if unicodedata.combining(char):
+            continue
+        used += 2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+        if used > width:
+            return text[:i]
+    return text
+
+def format_mp3_line(file, idx, focused_index, selected_index):
+    """Return the list line for a file, marked if it is focused or selected."""
+    if idx == selected_index:
+        # Selected, whether or not it is also focused
+        return f"- *> SELECTED >*{file}"
+    elif idx == focused_index:
+        # Only focused
+        return f"- *> {file} <*"
+    else:
+        # Neither focused nor selected
+        return f"- {file}"
+
+def display_mp3_files(mp3_files, order, focused_index, selected_index, input_folder_path, output_file_path,
+                      full_redraw=False, status=None):
+    """
+    Display the MP3 files with the focused file highlighted.
+    
+    After the first full draw, only the rows whose focus or selection
+    changed since the previous call are rewritten in place. Every line is
+    clipped to the terminal width so each one takes exactly one row. A full
+    redraw is done when requested, when the screen does not fit the
+    terminal since the rows cannot then be addressed directly, and when the
+    terminal size differs from that of the last full draw, including after
+    a draw that did not fit and scrolled. A status line is drawn below the
+    instructions by a full redraw and cleared by the next draw.
+    
+    Args:
+        mp3_files: List of MP3 filenames
+        order: Indices into mp3_files, in display order
+        focused_index: Index of the focused file
+        selected_index: Index of the selected file, or None
+        input_folder_path: Input folder shown in the header
+        output_file_path: Output file shown in the header
+        full_redraw: Whether to repaint the whole screen
+        status: Optional message to show below the instructions; giving one
+            forces a full redraw
+    """
+    global _prev_focused_index, _prev_selected_index, _drawn_terminal_size, _status_drawn
+    
+    terminal_size = shutil.get_terminal_size()
+    # Leave the last column free so no line reaches the terminal's edge
+    width = max(terminal_size.columns - 1, 1)
+    footer_row = LIST_START_ROW + len(order) + 1
+    # The cursor ends up on the row after the instructions, or after the status line
+    end_row = footer_row + 4 + (1 if status is not None else 0)
+    fits_terminal = end_row <= terminal_size.lines
+    
+    # The screen is built up here and written out in one go
+    output = []
+    
+    if (full_redraw or status is not None or _prev_focused_index is None or not fits_terminal
+            or terminal_size != _drawn_terminal_size):
+        lines = [
+            f"Input folder: {input_folder_path}",
+            f"Output file: {output_file_path}",
+            "",
+            "MP3 files found:",
+        ]
+        for idx, file_index in enumerate(order):
+            lines.append(format_mp3_line(mp3_files[file_index], idx, focused_index, selected_index))
+        lines += [
+            "",
+            "Use up/down arrow keys to navigate, Enter to select/deselect, 'q' to quit",
+            "When an item is selected, up/down arrows will reorder it in the list",
+            "Press 'd' to delete the selected item",
+            "Press 'c' to combine files in the current order",
+        ]
+        if status is not None:
+            lines.append(status)
+        
+        # Clear the screen, then add the lines with proper line endings
+        output.append("\033[2J\033[H")
+        for line in lines:
+            output.append(clip_to_width(line, width) + "\r\n")
+        
+        _drawn_terminal_size = terminal_size if fits_terminal else None
+        _status_drawn = status is not None
+    else:
+        # Rewrite only the rows that gained or lost focus or selection
+        dirty_rows = {_prev_focused_index, focused_index, _prev_selected_index, selected_index}
+        dirty_rows.discard(None)
+        
+        for idx in sorted(dirty_rows):
+            line = clip_to_width(format_mp3_line(mp3_files[order[idx]], idx, focused_index, selected_index),
+                                 width)
+            output.append(f"\033[{LIST_START_ROW + idx};1H\033[2K{line}")
+        
+        # Leave the cursor below the instructions, clearing any status line there
+        output.append(f"\033[{end_row};1H")
+        if _status_drawn:
+            output.append("\033[2K")
+            _status_drawn = False
+    
+    write_to_terminal("".join(output))
+    
+    _prev_focused_index = focused_index
+    _prev_selected_index = selected_index
 
 if __name__ == "__main__":
     # Parse command-line arguments
-    input_folder_path, output_file_path = parse_arguments()
+    input_folder_path, output_file_path, quality = parse_arguments()
     
     # Verify that the input folder exists and is a directory
     if not os.path.exists(input_folder_path):
@@ -130,12 +614,19 @@ if __name__ == "__main__":
         sys.exit(1)
     
     # Get list of MP3 files
-    mp3_files = list_mp3_files(input_folder_path)
+    mp3_files, mp3_paths = list_mp3_files(input_folder_path)
     
     if not mp3_files:
         print("No MP3 files found in the specified folder.")
         sys.exit(1)
     
+    # The file list is left as it is; reordering and deleting only change
+    # the display order, a list of indices into mp3_files
+    order = list(range(len(mp3_files)))
+    
+    # Probe the files while the user arranges them
+    start_background_probes(mp3_paths)
+    
     # Initialize focused and selected indices
     focused_index = 0
     selected_index = None
@@ -148,49 +639,44 @@ if __name__ == "__main__":
         tty.setraw(sys.stdin.fileno())
         
         # Display initial file list
-        display_mp3_files(mp3_files, focused_index, selected_index, input_folder_path, output_file_path)
+        display_mp3_files(mp3_files, order, focused_index, selected_index, input_folder_path, output_file_path)
         
-        # Interactive loop for navigation
-        while True:
-            # Read a single character from input
-            char = sys.stdin.read(1)
+        # Interactive loop for navigation; char stays None if input ends
+        # before any key is read
+        char = None
+        for char in read_keys(sys.stdin.fileno()):
+            # Message to show below the list after this key, if any
+            status = None
             
-            # Check for arrow key sequences
-            if char == '\x1b':
-                # It could be an escape sequence
-                next_char = sys.stdin.read(1)
-                if next_char == '[':
-                    # It's definitely an arrow key
-                    arrow_key = sys.stdin.read(1)
-                    
-                    if arrow_key == 'A':  # Up arrow
-                        if selected_index is not None:
-                            # An item is selected, so move it up in the list
-                            if selected_index > 0:
-                                # Swap with the item above
-                                mp3_files[selected_index], mp3_files[selected_index - 1] = \
-                                mp3_files[selected_index - 1], mp3_files[selected_index]
-                                # Move the selection up
-                                selected_index -= 1
-                                # Also move the focus
-                                focused_index = selected_index
-                        else:
-                            # No item selected, just move the focus up
-                            focused_index = max(0, focused_index - 1)
-                    elif arrow_key == 'B':  # Down arrow
-                        if selected_index is not None:
-                            # An item is selected, so move it down in the list
-                            if selected_index < len(mp3_files) - 1:
-                                # Swap with the item below
-                                mp3_files[selected_index], mp3_files[selected_index + 1] = \
-                                mp3_files[selected_index + 1], mp3_files[selected_index]
-                                # Move the selection down
-                                selected_index += 1
-                                # Also move the focus
-                                focused_index = selected_index
-                        else:
-                            # No item selected, just move the focus down
-                            focused_index = min(len(mp3_files) - 1, focused_index + 1)
+            # Check for arrow keys
+            if char == KEY_UP:
+                if selected_index is not None:
+                    # An item is selected, so move it up in the list
+                    if selected_index > 0:
+                        # Swap with the item above
+                        order[selected_index], order[selected_index - 1] = \
+                        order[selected_index - 1], order[selected_index]
+                        # Move the selection up
+                        selected_index -= 1
+                        # Also move the focus
+                        focused_index = selected_index
+                else:
+                    # No item selected, just move the focus up
+                    focused_index = max(0, focused_index - 1)
+            elif char == KEY_DOWN:
+                if selected_index is not None:
+                    # An item is selected, so move it down in the list
+                    if selected_index < len(order) - 1:
+                        # Swap with the item below
+                        order[selected_index], order[selected_index + 1] = \
+                        order[selected_index + 1], order[selected_index]
+                        # Move the selection down
+                        selected_index += 1
+                        # Also move the focus
+                        focused_index = selected_index
+                else:
+                    # No item selected, just move the focus down
+                    focused_index = min(len(order) - 1, focused_index + 1)
             
             # Check for Enter key (selection)
             elif char == '\r' or char == '\n':
@@ -205,13 +691,13 @@ if __name__ == "__main__":
             elif char == 'd':
                 if selected_index is not None:
                     # Store the name of the file being deleted for confirmation
-                    deleted_file = mp3_files[selected_index]
+                    deleted_file = mp3_files[order[selected_index]]
                     
                     # Delete the selected file from the list
-                    del mp3_files[selected_index]
+                    del order[selected_index]
                     
                     # Check if the list is now empty
-                    if not mp3_files:
+                    if not order:
                         # Restore terminal settings for proper output
                         termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, original_settings)
                         clear_screen()
@@ -220,17 +706,14 @@ if __name__ == "__main__":
                         sys.exit(0)
                     
                     # Adjust the focused_index if it's now out of bounds
-                    if focused_index >= len(mp3_files):
-                        focused_index = len(mp3_files) - 1
+                    if focused_index >= len(order):
+                        focused_index = len(order) - 1
                     
                     # Reset the selection
                     selected_index = None
                     
-                    # Force screen refresh with updated list
-                    clear_screen()
-                    display_mp3_files(mp3_files, focused_index, selected_index, input_folder_path, output_file_path)
-                    print(f"Deleted: {deleted_file}\r")
-                    sys.stdout.flush()
+                    # The redraw below repaints the updated list and shows the deletion
+                    status = f"Deleted: {deleted_file}"
             
             # Check for combine command
             elif char == 'c':
@@ -245,55 +728,80 @@ if __name__ == "__main__":
                 break
             
             # Redraw the file list with updated focus and selection
-            display_mp3_files(mp3_files, focused_index, selected_index, input_folder_path, output_file_path)
+            display_mp3_files(mp3_files, order, focused_index, selected_index, input_folder_path, output_file_path,
+                              status=status)
         
         # If we exited by pressing 'c', show the final ordered list
         if char == 'c':
+            playlist = []
+            full_paths = []
+            for file_index in order:
+                # The output is written while the inputs are still being read,
+                # so a previous output in the input folder must not be an input
+                if is_same_file(mp3_paths[file_index], output_file_path):
+                    print(f"Warning: Skipping '{mp3_files[file_index]}' because it is the output file.")
+                    continue
+                playlist.append(mp3_files[file_index])
+                full_paths.append(mp3_paths[file_index])
+            
+            if not playlist:
+                print("Error: No valid MP3 files could be processed.", file=sys.stderr)
+                sys.exit(1)
+            
             print("Files will be combined in this order:")
-            for idx, file in enumerate(mp3_files):
+            for idx, file in enumerate(playlist):
                 print(f"{idx+1}. {file}")
             print(f"\nOutput will be saved to: {output_file_path}")
             
-            # Initialize an empty AudioSegment for the combined audio
-            combined_audio = AudioSegment.empty()
+            print(f"\nSaving combined audio to {output_file_path}...")
             
-            # Iterate through the MP3 files and combine them
-            for i, filename in enumerate(mp3_files):
-                # Construct full file path
-                full_path = os.path.join(input_folder_path, filename)
-                
-                print(f"Processing: {filename}")
-                
-                # Read the MP3 file with error handling
+            # If every file has the same format, try to join the MP3 frames as they are
+            copied = False
+            stream_params = get_stream_copy_params(full_paths)
+            if stream_params is not None:
+                print("All files share the same format, joining them without re-encoding")
                 try:
-                    audio = read_mp3_file(full_path)
-                    
-                    # Append the audio to the combined audio
-                    combined_audio += audio
-                    
-                    # Add silence between tracks (except after the last file)
-                    if i < len(mp3_files) - 1:
-                        silence = generate_silence(3000)  # 3 seconds of silence
-                        combined_audio += silence
-                        print(f"Added 3 seconds of silence after {filename}")
-                except (CouldntDecodeError, IOError, OSError) as e:
-                    print(f"Warning: Could not process file '{filename}'. Skipping. Error: {str(e)}")
-                    continue
+                    concat_mp3_files(full_paths, output_file_path, stream_params, 3000)
+                    copied = True
+                except (subprocess.CalledProcessError, OSError) as e:
+                    # Fall back to re-encoding, which skips unreadable files one by one
+                    print(f"Warning: Could not join the files without re-encoding. Re-encoding them instead. "
+                          f"Error: {str(e)}")
             
-            # Only export if we have audio to export
-            if len(combined_audio) > 0:
-                print(f"\nSaving combined audio to {output_file_path}...")
-                # Export the combined audio to the output file
+            if copied:
+                print(f"Successfully saved combined audio to {output_file_path}")
                 try:
-                    combined_audio.export(output_file_path, format="mp3", bitrate="320k")
+                    duration = float(probe_mp3_file(output_file_path)['duration'])
+                    print(f"Total duration: {duration:.2f} seconds")
+                except (subprocess.CalledProcessError, OSError, ValueError, LookupError):
+                    # The output was written; only its duration is unknown
+                    pass
+            else:
+                # Decode the files in parallel and stream them, in playlist order,
+                # into the encoder with 3 seconds of silence between them
+                try:
+                    prefetch_files(full_paths[:PREFETCH_AHEAD])
+                    # Keep every decoder busy plus one decoded track ready for the encoder
+                    decode_workers = os.cpu_count() or 1
+                    with ThreadPoolExecutor(max_workers=decode_workers) as executor:
+                        pcm_chunks = collect_decoded_tracks(executor, playlist, full_paths, decode_workers + 1)
+                        total_bytes = encode_pcm_chunks(pcm_chunks, output_file_path, 3000, quality)
+                except subprocess.CalledProcessError as e:
+                    # ffmpeg has already printed its own reason, e.g. the output could not be written
+                    print(f"Error: Could not encode the combined audio to '{output_file_path}'. Error: {str(e)}",
+                          file=sys.stderr)
+                    sys.exit(1)
+                except OSError as e:
+                    # For example, ffmpeg is not installed
+                    print(f"Error: Could not combine the files. Error: {str(e)}", file=sys.stderr)
+                    sys.exit(1)
+                
+                if total_bytes > 0:
                     print(f"Successfully saved combined audio to {output_file_path}")
-                    print(f"Total duration: {len(combined_audio)/1000:.2f} seconds")
-                except IOError:
-                    print(f"Error: Could not write to the specified output file '{output_file_path}'.", file=sys.stderr)
+                    print(f"Total duration: {total_bytes / (SAMPLE_RATE * CHANNELS * SAMPLE_WIDTH):.2f} seconds")
+                else:
+                    print("Error: No valid MP3 files could be processed.", file=sys.stderr)
                     sys.exit(1)
-            else:
-                print("Error: No valid MP3 files could be processed.", file=sys.stderr)
-                sys.exit(1)
     
     finally:
         # Restore original terminal settings